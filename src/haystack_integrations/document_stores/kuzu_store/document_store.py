@@ -1,7 +1,15 @@
-import ast
+import functools
+import itertools
 import logging
 import json
-from typing import Any, Dict, List, Optional
+import os
+import tempfile
+import threading
+import warnings
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import kuzu
 from haystack import Document, default_from_dict, default_to_dict
@@ -11,139 +19,519 @@ from haystack.core.errors import DeserializationError
 
 logger = logging.getLogger(__name__)
 
+# Columns returned for every document read from the store
+_DOCUMENT_COLUMNS = "d.id, d.content, d.meta_STRING, d.meta_INT, d.meta_FLOAT, d.embedding"
+
+# Document fields stored as their own columns, filterable without going through the meta maps
+_DOCUMENT_FIELDS = ("id", "content")
+
+# Value type of each `meta_*` map
+_META_VALUE_TYPES = {"STRING": "STRING", "INT": "INT64", "FLOAT": "FLOAT"}
+
+# Name of the HNSW index created over `embedding` when the store has a fixed embedding dimension
+_VECTOR_INDEX = "documents_embedding_idx"
+
+# Maximum number of prepared filter queries kept per store
+_FILTER_STATEMENT_CACHE_SIZE = 256
+
+# Filter comparison operators and their Cypher equivalents; `not in` is compiled as `NOT (... IN ...)`
+_COMPARISON_OPERATORS = {
+    "==": "=",
+    "!=": "<>",
+    ">": ">",
+    ">=": ">=",
+    "<": "<",
+    "<=": "<=",
+    "in": "IN",
+    "not in": "IN",
+}
+
+
+def _close_database(connection: kuzu.Connection, db: kuzu.Database, *, checkpoint: bool) -> None:
+    """
+    Closes a store's connection and database, taking a final checkpoint first if requested.
+    """
+    try:
+        if checkpoint:
+            connection.execute("CHECKPOINT")
+    finally:
+        connection.close()
+        db.close()
+
+
+def _merge_meta(
+    meta_string: Optional[Dict[str, str]], meta_int: Optional[Dict[str, int]], meta_float: Optional[Dict[str, float]]
+) -> Dict[str, Any]:
+    """
+    Merges a row's `meta_STRING`, `meta_INT` and `meta_FLOAT` maps into one Document meta dict.
+    """
+    # Kuzu returns fresh dicts per row, so a lone non-empty map is used as is instead of copied
+    if meta_int or meta_float:
+        return {**(meta_string or {}), **(meta_int or {}), **(meta_float or {})}
+    return meta_string or {}
+
 
 class KuzuDocumentStore:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, *, bulk_load_mode: bool = False, embedding_dim: Optional[int] = None):
         """
         Initializes the Kuzu document store.
 
         Args:
             db_path: Path to the Kuzu database
+            bulk_load_mode: Disable automatic checkpointing while ingesting; a single
+                checkpoint is then taken when the store is closed
+            embedding_dim: Store embeddings as fixed-size arrays of this dimension and index them
+                with an HNSW vector index; without it, embedding retrieval scans all embeddings
         """
-        self.db = kuzu.Database(db_path)
+        self._db_path = db_path
+        self.bulk_load_mode = bulk_load_mode
+        self.embedding_dim = embedding_dim
+        embedding_type = f"FLOAT[{int(embedding_dim)}]" if embedding_dim else "FLOAT[]"
+        # Kuzu always logs writes to a WAL and has no separate concurrent-reader mode to enable:
+        # a single persistent connection guarded by a lock is shared by all threads instead
+        self.db = kuzu.Database(db_path, auto_checkpoint=not bulk_load_mode)
         self.connection = kuzu.Connection(self.db)
+        self._lock = threading.RLock()
+        # Exact value type -> meta map suffix; bool is stored as INT like its int base class
+        self._meta_dispatch = {str: "STRING", int: "INT", bool: "INT", float: "FLOAT"}
+        self._in_transaction = False
+        # Number of stored documents, tracked across writes and deletes once it has been counted
+        self._doc_count: Optional[int] = None
 
         # Define document schema with separate fields for different `meta` data types
         self.connection.execute(
-            """
+            f"""
             CREATE NODE TABLE IF NOT EXISTS documents(
                 id STRING,
                 content STRING,
                 meta_STRING MAP(STRING, STRING),
                 meta_INT MAP(STRING, INT64),
                 meta_FLOAT MAP(STRING, FLOAT),
-                embedding FLOAT[],
+                embedding {embedding_type},
                 PRIMARY KEY (id)
             )
             """
         )
+        self._check_embedding_type(embedding_type)
+        if embedding_dim:
+            self._create_vector_index()
+
+        # Prepare the fixed statements once so they are not re-parsed and re-planned on every call
+        # Id lookups go through the primary key index: a single id is a direct key scan, several ids are
+        # unwound and joined on the key. `WHERE d.id IN $ids` would scan the whole table instead
+        self._ps_exists_one = self._prepare("MATCH (d:documents {id: $id}) RETURN d.id")
+        self._ps_exists = self._prepare("UNWIND $ids AS i MATCH (d:documents {id: i}) RETURN d.id")
+        self._ps_delete_one = self._prepare("MATCH (d:documents {id: $id}) DELETE d")
+        self._ps_delete = self._prepare("UNWIND $ids AS i MATCH (d:documents {id: i}) DELETE d")
+        self._ps_insert = self._prepare(
+            f"""
+            UNWIND $rows AS r
+            CREATE (d:documents {{
+                id: r.id,
+                content: r.content,
+                meta_STRING: map(CAST(r.string_keys AS STRING[]), CAST(r.string_values AS STRING[])),
+                meta_INT: map(CAST(r.int_keys AS STRING[]), CAST(r.int_values AS INT64[])),
+                meta_FLOAT: map(CAST(r.float_keys AS STRING[]), CAST(r.float_values AS FLOAT[])),
+                embedding: CASE
+                    WHEN size(CAST(r.embedding AS FLOAT[])) = 0 THEN NULL
+                    ELSE CAST(r.embedding AS {embedding_type})
+                END
+            }})
+            """
+        )
+        self._ps_count = self._prepare("MATCH (d:documents) RETURN count(d) as count")
+        self._ps_all = self._prepare(f"MATCH (d:documents) RETURN {_DOCUMENT_COLUMNS}")
+        self._ps_content_search = self._prepare(
+            f"MATCH (d:documents) WHERE d.content CONTAINS $query RETURN {_DOCUMENT_COLUMNS} LIMIT $limit"
+        )
+        # Prepared filter queries keyed by their compiled WHERE and RETURN clauses, least recently used first
+        self._filter_statements: "OrderedDict[Tuple[str, str], kuzu.PreparedStatement]" = OrderedDict()
+        # Closes the database when the store is garbage collected or, at the latest, at interpreter exit,
+        # without keeping the store alive the way an atexit registration would
+        self._finalizer = weakref.finalize(self, _close_database, self.connection, self.db, checkpoint=bulk_load_mode)
         logger.info("Initialized KuzuDocumentStore with database at %s", db_path)
 
+    def _prepare(self, query: str) -> kuzu.PreparedStatement:
+        """
+        Prepares a statement for repeated execution.
+        """
+        # Kuzu deprecates the separate prepare API, but it is still the only way to reuse a plan across calls
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            return self.connection.prepare(query)
+
+    def _check_embedding_type(self, embedding_type: str) -> None:
+        """
+        Checks that an existing `documents` table stores embeddings as `embedding_type`.
+
+        Reopening a database with a different `embedding_dim` would otherwise only fail later, with
+        Kuzu binder errors on index creation or on every write.
+        """
+        result = self.connection.execute("CALL table_info('documents') WHERE name = 'embedding' RETURN type")
+        existing_type = result.get_next()[0]
+        if existing_type != embedding_type:
+            self.connection.close()
+            self.db.close()
+            raise ValueError(
+                f"The database at {self._db_path} stores embeddings as {existing_type}, but the store was "
+                f"opened with embedding_dim={self.embedding_dim}, which requires {embedding_type}."
+            )
+
+    def _create_vector_index(self) -> None:
+        """
+        Creates the HNSW index over `embedding` unless it already exists.
+        """
+        result = self.connection.execute("CALL SHOW_INDEXES() RETURN index_name")
+        while result.has_next():
+            if result.get_next()[0] == _VECTOR_INDEX:
+                return
+        self.connection.execute(
+            f"CALL CREATE_VECTOR_INDEX('documents', '{_VECTOR_INDEX}', 'embedding', metric := 'cosine')"
+        )
+
+    def close(self) -> None:
+        """
+        Closes the connection and the database, checkpointing first when in bulk load mode.
+
+        Safe to call more than once; it also happens automatically when the store is garbage
+        collected or the interpreter exits.
+        """
+        with self._lock:
+            self._finalizer()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Runs the enclosed statements in one transaction so they are committed together.
+
+        Nested uses join the outer transaction. The lock is held until the transaction ends,
+        so statements from other threads cannot interleave with it.
+        """
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+
+            self.connection.execute("BEGIN TRANSACTION")
+            self._in_transaction = True
+            try:
+                yield
+                self.connection.execute("COMMIT")
+            except BaseException:
+                # Interrupts and a failed COMMIT end the transaction too; counts adjusted inside it no longer hold
+                self._doc_count = None
+                try:
+                    self.connection.execute("ROLLBACK")
+                except RuntimeError:
+                    # Kuzu has already rolled back if one of the statements failed
+                    pass
+                raise
+            finally:
+                self._in_transaction = False
+
     def count_documents(self) -> int:
         """
         Counts the number of documents in the store.
+
+        The count is queried once and then maintained by `write_documents` and `delete_documents`.
+        Call `invalidate_count()` if the database is modified by anything other than this store.
         """
-        result = self.connection.execute("MATCH (d:documents) RETURN count(d) as count")
-        return result.get_next()[0]
+        with self._lock:
+            if self._doc_count is None:
+                result = self.connection.execute(self._ps_count)
+                self._doc_count = result.get_next()[0]
+            return self._doc_count
 
-    def _categorize_meta(self, meta: Dict[str, Any]) -> Dict[str, Dict[str, List[Any]]]:
+    def invalidate_count(self) -> None:
         """
-        Categorizes meta into `meta_STRING`, `meta_INT`, and `meta_FLOAT` fields,
-        each formatted as `{"key": [...], "value": [...]}` dictionaries.
+        Forgets the cached document count so the next `count_documents()` queries the database.
         """
-        meta_dict = {
-            "meta_STRING": {"key": [], "value": []},
-            "meta_INT": {"key": [], "value": []},
-            "meta_FLOAT": {"key": [], "value": []}
+        with self._lock:
+            self._doc_count = None
+
+    def exists(self, document_id: str) -> bool:
+        """
+        Checks whether a document with the given id is stored, without reading the document itself.
+        """
+        return bool(self._existing_ids([document_id]))
+
+    def _meta_type(self, value: Any) -> Optional[str]:
+        """
+        Returns the meta map suffix (`STRING`, `INT` or `FLOAT`) for a value, or None if it has no map.
+        """
+        meta_type = self._meta_dispatch.get(type(value))
+        if meta_type is None:
+            # Subclasses (e.g. str-based enums) miss the exact type lookup
+            meta_type = next((name for kind, name in self._meta_dispatch.items() if isinstance(value, kind)), None)
+        return meta_type
+
+    def _categorize_meta(self, meta: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        Categorizes meta into the flat `string_*`, `int_*` and `float_*` key and value lists
+        that are turned into the `meta_STRING`, `meta_INT`, and `meta_FLOAT` maps on insert.
+        """
+        string_keys, string_values, int_keys, int_values, float_keys, float_values = [], [], [], [], [], []
+        appenders = {
+            "STRING": (string_keys.append, string_values.append),
+            "INT": (int_keys.append, int_values.append),
+            "FLOAT": (float_keys.append, float_values.append),
         }
+        meta_type = self._meta_type
 
         for key, value in meta.items():
-            if isinstance(value, str):
-                meta_dict["meta_STRING"]["key"].append(key)
-                meta_dict["meta_STRING"]["value"].append(value)
-            elif isinstance(value, int):
-                meta_dict["meta_INT"]["key"].append(key)
-                meta_dict["meta_INT"]["value"].append(value)
-            elif isinstance(value, float):
-                meta_dict["meta_FLOAT"]["key"].append(key)
-                meta_dict["meta_FLOAT"]["value"].append(value)
-            else:
+            bucket = meta_type(value)
+            if bucket is None:
                 logger.warning(f"Unsupported meta type for key {key}: {type(value).__name__}")
+                continue
+            key_append, value_append = appenders[bucket]
+            key_append(key)
+            # Booleans are stored as integers; left as bool they give the row a BOOL[] list that
+            # cannot be unwound together with rows holding INT64[] lists
+            value_append(int(value) if bucket == "INT" else value)
 
-        return meta_dict
+        return {
+            "string_keys": string_keys,
+            "string_values": string_values,
+            "int_keys": int_keys,
+            "int_values": int_values,
+            "float_keys": float_keys,
+            "float_values": float_values,
+        }
+
+    def _existing_ids(self, ids: List[str]) -> Set[str]:
+        """
+        Returns the subset of `ids` that are already stored, using a single query.
+        """
+        existing = set()
+        with self._lock:
+            if len(ids) == 1:
+                result = self.connection.execute(self._ps_exists_one, {"id": ids[0]})
+            else:
+                result = self.connection.execute(self._ps_exists, {"ids": ids})
+            while result.has_next():
+                existing.add(result.get_next()[0])
+        return existing
 
+    def _delete_ids(self, ids: List[str]) -> None:
+        """
+        Deletes the documents with the given ids, which must be stored and free of duplicates.
+        """
+        with self._lock:
+            if len(ids) == 1:
+                self.connection.execute(self._ps_delete_one, {"id": ids[0]})
+            else:
+                self.connection.execute(self._ps_delete, {"ids": ids})
 
     def write_documents(self, documents: List[Document], policy: DuplicatePolicy = DuplicatePolicy.NONE) -> int:
         """
         Writes documents to the store, handling metadata by type.
+
+        Existing ids are looked up once for the whole batch and the surviving documents
+        are inserted with a single `UNWIND ... CREATE` statement, all inside one transaction.
         """
-        document_written = 0
-        for doc in documents:
-            # Check if the document already exists
-            result = self.connection.execute("MATCH (d:documents) WHERE d.id = $id RETURN d", {"id": doc.id})
-
-            # Convert policy to DuplicatePolicy if it is passed as a string
-            if isinstance(policy, str):
-                policy = DuplicatePolicy(policy)
-            
-            if result.has_next():
-                if policy == DuplicatePolicy.FAIL:
-                    raise DuplicateDocumentError(f"Document with id {doc.id} already exists.")
-                elif policy == DuplicatePolicy.SKIP:
-                    continue
-                elif policy == DuplicatePolicy.OVERWRITE:
-                    # Delete the existing document with the same id
-                    self.connection.execute("MATCH (d:documents) WHERE d.id = $id DELETE d", {"id": doc.id})
-
-            # Categorize meta data by type
-            categorized_meta = self._categorize_meta(doc.meta or {})
-
-            # Define query to create a document node with type-specific metadata fields
-            query = """
-            CREATE (d:documents {
-                id: $id,
-                content: $content,
-                meta_STRING: $meta_STRING,
-                meta_INT: $meta_INT,
-                meta_FLOAT: $meta_FLOAT
-            })
-            """
-            params = {
-                "id": doc.id,
-                "content": doc.content,
-                "meta_STRING": categorized_meta["meta_STRING"],
-                "meta_INT": categorized_meta["meta_INT"],
-                "meta_FLOAT": categorized_meta["meta_FLOAT"]
-            }
-            self.connection.execute(query, params)
-            document_written += 1
+        if not documents:
+            return 0
+
+        # Convert policy to DuplicatePolicy if it is passed as a string
+        if isinstance(policy, str):
+            policy = DuplicatePolicy(policy)
+
+        with self._transaction():
+            # One lookup for the whole batch; repeated ids are only sent once
+            existing = self._existing_ids(list(dict.fromkeys(doc.id for doc in documents)))
+            rows: List[Dict[str, Any]] = []
+            row_index: Dict[str, int] = {}
+            overwritten: List[str] = []
+
+            # Resolve the policy once instead of comparing it for every document
+            # Without a policy duplicates are rejected, as with FAIL
+            fail = policy in (DuplicatePolicy.FAIL, DuplicatePolicy.NONE)
+            skip = policy == DuplicatePolicy.SKIP
+            overwrite = policy == DuplicatePolicy.OVERWRITE
+            categorize_meta = self._categorize_meta
+
+            for doc in documents:
+                doc_id = doc.id
+                replaces = None
+                # Duplicates may come from the store or from earlier documents in this batch
+                if doc_id in existing or doc_id in row_index:
+                    if fail:
+                        raise DuplicateDocumentError(f"Document with id {doc_id} already exists.")
+                    elif skip:
+                        continue
+                    elif overwrite:
+                        if doc_id in existing:
+                            # Delete the existing document with the same id before inserting
+                            overwritten.append(doc_id)
+                            existing.discard(doc_id)
+                        else:
+                            # A later document in the same batch replaces the earlier one
+                            replaces = row_index[doc_id]
+
+                # Categorize meta data by type; keys and values travel as flat lists
+                # because Kuzu cannot infer the type of an empty MAP inside UNWIND
+                row = {
+                    "id": doc_id,
+                    "content": doc.content,
+                    "embedding": doc.embedding or [],
+                    **categorize_meta(doc.meta or {}),
+                }
+                if replaces is not None:
+                    rows[replaces] = row
+                else:
+                    row_index[doc_id] = len(rows)
+                    rows.append(row)
+
+            if overwritten:
+                self._delete_ids(overwritten)
+
+            if rows:
+                # Create all document nodes with type-specific metadata fields at once
+                self.connection.execute(self._ps_insert, {"rows": rows})
+
+            if self._doc_count is not None:
+                self._doc_count += len(rows) - len(overwritten)
+
+        return len(rows)
+
+
+    def bulk_load(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = 10_000,
+        policy: DuplicatePolicy = DuplicatePolicy.NONE,
+    ) -> int:
+        """
+        Writes documents from any iterable in batches, committing once per batch.
+
+        Combine with `bulk_load_mode=True` so checkpointing is deferred until the store is closed.
 
-        return document_written
+        :param documents: the documents to write; consumed lazily.
+        :param batch_size: the number of documents written per transaction.
+        :param policy: the duplicate policy applied to each batch.
+        :return: the number of documents written.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, but got {batch_size}")
+
+        written = 0
+        iterator = iter(documents)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return written
+            written += self.write_documents(batch, policy=policy)
+
+    def bulk_copy_from_parquet(self, path: str) -> None:
+        """
+        Loads documents from a Parquet file with Kuzu's `COPY FROM`, bypassing Cypher inserts entirely.
+
+        The file must have the columns `id`, `content`, `meta_STRING`, `meta_INT`, `meta_FLOAT` and
+        `embedding` with the store's column types, as written by `bulk_copy_documents`. Ids must not
+        already exist in the store; duplicate policies are not applied.
+
+        :param path: path of the Parquet file to load.
+        """
+        if "'" in path:
+            raise ValueError(f"Unsupported character in Parquet path: {path}")
 
+        with self._lock:
+            try:
+                self.connection.execute(f"COPY documents FROM '{path}'")
+            finally:
+                self._doc_count = None
+
+    def bulk_copy_documents(self, documents: List[Document]) -> int:
+        """
+        Writes documents through a temporary Parquet file and `COPY FROM`, for fast initial ingest.
+
+        Requires `pyarrow` (`pip install kuzu-store[parquet]`). Ids must not already exist in the store.
+
+        :param documents: the documents to load.
+        :return: the number of documents written.
+        """
+        if not documents:
+            return 0
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("bulk_copy_documents requires pyarrow: pip install kuzu-store[parquet]") from error
+
+        categorized = [self._categorize_meta(doc.meta or {}) for doc in documents]
+        if self.embedding_dim:
+            embedding_type = pa.list_(pa.float32(), self.embedding_dim)
+        else:
+            embedding_type = pa.list_(pa.float32())
+        table = pa.table(
+            {
+                "id": pa.array([doc.id for doc in documents], type=pa.string()),
+                "content": pa.array([doc.content for doc in documents], type=pa.string()),
+                "meta_STRING": pa.array(
+                    [list(zip(c["string_keys"], c["string_values"])) for c in categorized],
+                    type=pa.map_(pa.string(), pa.string()),
+                ),
+                "meta_INT": pa.array(
+                    [list(zip(c["int_keys"], c["int_values"])) for c in categorized],
+                    type=pa.map_(pa.string(), pa.int64()),
+                ),
+                "meta_FLOAT": pa.array(
+                    [list(zip(c["float_keys"], c["float_values"])) for c in categorized],
+                    type=pa.map_(pa.string(), pa.float32()),
+                ),
+                "embedding": pa.array([doc.embedding or None for doc in documents], type=embedding_type),
+            }
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "documents.parquet")
+            pq.write_table(table, path)
+            self.bulk_copy_from_parquet(path)
+        return len(documents)
 
     def delete_documents(self, document_ids: List[str]) -> None:
         """
         Deletes documents from the store.
+
+        Raises `MissingDocumentError` listing every id that is not stored; nothing is deleted in that case.
         """
-        for doc_id in document_ids:
-            result = self.connection.execute("MATCH (d:documents) WHERE d.id = $id RETURN d.id", {"id": doc_id})
-            if result.get_next() is None:
-                raise MissingDocumentError(f"ID '{doc_id}' not found, cannot delete it.")
+        if not document_ids:
+            return
+
+        with self._transaction():
+            found = self._existing_ids(document_ids)
+            missing = [doc_id for doc_id in document_ids if doc_id not in found]
+            if missing:
+                ids = ", ".join(f"'{doc_id}'" for doc_id in missing)
+                raise MissingDocumentError(f"IDs {ids} not found, cannot delete them.")
 
-            self.connection.execute("MATCH (d:documents) WHERE d.id = $id DELETE d", {"id": doc_id})
+            self._delete_ids(list(found))
+            if self._doc_count is not None:
+                self._doc_count -= len(found)
 
-    def _build_filter_query(self, filters: Dict[str, Any]) -> str:
+    def _build_filter_query(self, filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
-        Builds a WHERE clause for filtering documents.
+        Builds a WHERE clause for filtering documents, together with the parameters it references.
+
+        Filters with the same structure share one compiled clause; only the parameters differ.
         """
         if not filters:
-            return ""
+            return "", {}
+
+        values: List[Any] = []
+        shape = self._filter_shape(filters, values)
+        return self._compile_filter(shape), {f"p{i}": value for i, value in enumerate(values)}
 
+    def _filter_shape(self, filters: Dict[str, Any], values: List[Any]) -> Tuple[Any, ...]:
+        """
+        Reduces filters to their structure, appending the concrete values to `values` in placeholder order.
+        """
         # Check if `filters` is a single condition (not nested)
         if "field" in filters and "operator" in filters and "value" in filters:
             # Handle as a single condition
-            return self._build_single_condition(filters)
-        
+            return self._condition_shape(filters, values)
+
         # If not a single condition, treat as nested conditions
         operator = filters.get("operator", "AND").upper()
         if operator not in ["AND", "OR", "NOT"]:
@@ -152,76 +540,152 @@ class KuzuDocumentStore:
         conditions = []
         for condition in filters.get("conditions", []):
             if "conditions" in condition:
-                # Recursively build nested conditions
-                nested_query = self._build_filter_query(condition)
-                conditions.append(f"NOT ({nested_query})" if operator == "NOT" else f"({nested_query})")
+                # Recursively reduce nested conditions
+                conditions.append(("nested", self._filter_shape(condition, values)))
             else:
-                # Build individual condition
-                conditions.append(self._build_single_condition(condition))
+                conditions.append(self._condition_shape(condition, values))
 
-        # Join conditions with the specified operator
-        joined_conditions = f" {operator} ".join(conditions)
-        return f"({joined_conditions})" if len(conditions) > 1 else joined_conditions
+        return ("logic", operator, tuple(conditions))
 
-    def _build_single_condition(self, condition: Dict[str, Any]) -> str:
+    def _condition_shape(self, condition: Dict[str, Any], values: List[Any]) -> Tuple[Any, ...]:
         """
-        Builds a single condition for the WHERE clause.
+        Reduces a single comparison to `("condition", operator, meta type)`, collecting its key and value.
+
+        Comparisons on the `id` and `content` columns reduce to `("column", operator, column)` and only
+        collect their value.
         """
         field = condition["field"]
-        if not field.startswith("meta."):
-            raise ValueError(f"Unsupported field format: {field}")
-        key = field.split("meta.", 1)[1]
         value = condition["value"]
         op = condition["operator"]
 
-        # Determine the correct field access based on type
-        if isinstance(value, str):
-            field_access = f"map_extract(d.meta_STRING, '{key}')[1]"
-        elif isinstance(value, int):
-            field_access = f"map_extract(d.meta_INT, '{key}')[1]"
-        elif isinstance(value, float):
-            field_access = f"map_extract(d.meta_FLOAT, '{key}')[1]"
-        else:
-            raise ValueError(f"Unsupported filter value type: {type(value).__name__}")
-
-        # Safely format the value
-        formatted_value = self._format_value(value)
-
-        # Build the condition based on the operator
-        if op == "==":
-            return f"{field_access} = {formatted_value}"
-        elif op == "!=":
-            return f"{field_access} <> {formatted_value}"
-        elif op == ">=":
-            return f"{field_access} >= {formatted_value}"
-        elif op == "<=":
-            return f"{field_access} <= {formatted_value}"
-        elif op == ">":
-            return f"{field_access} > {formatted_value}"
-        elif op == "<":
-            return f"{field_access} < {formatted_value}"
-        elif op == "in":
-            if not isinstance(value, list):
-                raise ValueError("Operator 'in' requires a list of values.")
-            value_list = ", ".join([self._format_value(v) for v in value])
-            return f"{field_access} IN [{value_list}]"
-        elif op == "not in":
+        if op not in _COMPARISON_OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        if op in ("in", "not in"):
             if not isinstance(value, list):
-                raise ValueError("Operator 'not in' requires a list of values.")
-            value_list = ", ".join([self._format_value(v) for v in value])
-            return f"{field_access} NOT IN [{value_list}]"
+                raise ValueError(f"Operator '{op}' requires a list of values.")
+            samples = value or [""]
         else:
-            raise ValueError(f"Unsupported operator: {op}")
+            samples = [value]
+
+        if field in _DOCUMENT_FIELDS:
+            if not all(isinstance(sample, str) for sample in samples):
+                raise ValueError(f"Field '{field}' can only be compared with strings.")
+            values.append(value)
+            return ("column", op, field)
+
+        if not field.startswith("meta."):
+            raise ValueError(f"Unsupported field format: {field}")
+        key = field.split("meta.", 1)[1]
 
-    def _format_value(self, value):
+        # Determine the correct meta map based on type; only one map is searched, so a list must not mix them
+        meta_types = set()
+        for sample in samples:
+            meta_type = self._meta_type(sample)
+            if meta_type is None:
+                raise ValueError(f"Unsupported filter value type: {type(sample).__name__}")
+            meta_types.add(meta_type)
+        if len(meta_types) > 1:
+            raise ValueError(f"Values of operator '{op}' must all be strings, all integers or all floats.")
+        meta_type = meta_types.pop()
+
+        # Booleans are stored as integers
+        if isinstance(value, list):
+            value = [int(v) if isinstance(v, bool) else v for v in value]
+        elif isinstance(value, bool):
+            value = int(value)
+
+        values.append(key)
+        values.append(value)
+        return ("condition", op, meta_type)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_filter(shape: Tuple[Any, ...]) -> str:
+        """
+        Compiles a filter shape into a WHERE clause using `$p0`, `$p1`, ... placeholders.
+        """
+        placeholders = (f"$p{i}" for i in itertools.count())
+
+        def compile_shape(node: Tuple[Any, ...]) -> str:
+            if node[0] == "column":
+                _, op, column = node
+                value = next(placeholders)
+                if op == "not in":
+                    # Kuzu has no `NOT IN` operator
+                    return f"NOT (d.{column} IN {value})"
+                return f"d.{column} {_COMPARISON_OPERATORS[op]} {value}"
+
+            if node[0] == "condition":
+                _, op, meta_type = node
+                key, value = next(placeholders), next(placeholders)
+                # Appending a typed NULL turns a missing key into NULL instead of an out-of-range error
+                field_access = (
+                    f"list_concat(map_extract(d.meta_{meta_type}, {key}), "
+                    f"CAST([NULL] AS {_META_VALUE_TYPES[meta_type]}[]))[1]"
+                )
+                # Comparisons against a missing key are false rather than NULL, so that documents without
+                # the key are kept by `!=`, `not in` and `NOT`
+                if op in ("!=", "not in"):
+                    positive = "=" if op == "!=" else "IN"
+                    return f"NOT coalesce({field_access} {positive} {value}, false)"
+                return f"coalesce({field_access} {_COMPARISON_OPERATORS[op]} {value}, false)"
+
+            _, operator, conditions = node
+            compiled = []
+            for condition in conditions:
+                if condition[0] == "nested":
+                    compiled.append(f"({compile_shape(condition[1])})")
+                else:
+                    compiled.append(compile_shape(condition))
+
+            if operator == "NOT":
+                # NOT negates the conjunction of its conditions
+                return f"NOT ({' AND '.join(compiled)})"
+            # Join conditions with the specified operator
+            joined_conditions = f" {operator} ".join(compiled)
+            return f"({joined_conditions})" if len(compiled) > 1 else joined_conditions
+
+        return compile_shape(shape)
+
+    def _prepared_filter(self, where_clause: str, return_clause: str = _DOCUMENT_COLUMNS) -> kuzu.PreparedStatement:
         """
-        Formats value for Cypher syntax.
+        Returns the prepared filter query for a compiled WHERE clause, preparing it on first use.
+        """
+        key = (where_clause, return_clause)
+        statement = self._filter_statements.get(key)
+        if statement is not None:
+            self._filter_statements.move_to_end(key)
+            return statement
+
+        where = f"WHERE {where_clause} " if where_clause else ""
+        statement = self._prepare(f"MATCH (d:documents) {where}RETURN {return_clause}")
+        self._filter_statements[key] = statement
+        if len(self._filter_statements) > _FILTER_STATEMENT_CACHE_SIZE:
+            self._filter_statements.popitem(last=False)
+        return statement
+
+    def filter_ids(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Returns the ids of the documents that match the filters, without reading their content or meta.
+
+        Accepts the same filters as `filter_documents`.
+
+        :param filters: the filters to apply to the document list.
+        :param limit: the maximum number of ids to return.
+        :return: a list of document ids.
         """
-        if isinstance(value, str):
-            return f"'{value}'"
-        elif value is None:
-            return "null"
-        return value
+        where_clause, params = self._build_filter_query(filters or {})
+        return_clause = "d.id"
+        if limit is not None:
+            return_clause += " LIMIT $limit"
+            params["limit"] = limit
+
+        ids = []
+        with self._lock:
+            result = self.connection.execute(self._prepared_filter(where_clause, return_clause), params)
+            while result.has_next():
+                ids.append(result.get_next()[0])
+        return ids
 
     def filter_documents(self, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
         """
@@ -237,6 +701,8 @@ class KuzuDocumentStore:
         - `operator`
         - `value`
 
+        `field` is either `id`, `content` or a `meta.` key.
+
         Logic dictionaries must contain the keys:
 
         - `operator`
@@ -289,43 +755,109 @@ class KuzuDocumentStore:
         :param filters: the filters to apply to the document list.
         :return: a list of Documents that match the given filters.
         """
-        documents = []
-        query = "MATCH (d:documents) "
+        return list(self.iter_documents(filters))
+
+    def iter_documents(self, filters: Optional[Dict[str, Any]] = None, chunk: int = 1024) -> Iterator[Document]:
+        """
+        Returns an iterator over the documents that match the filters provided, building them as it is consumed.
+
+        The query runs immediately, so invalid filters raise here rather than on the first `next()`, and
+        Kuzu holds the whole result from then on. Only the `Document` objects are created lazily, from
+        rows fetched `chunk` at a time, so unlike `filter_documents` they are not all held in a list at
+        once; this does not bound the memory used by the result itself.
 
-        if filters:
-            where_clause = self._build_filter_query(filters)
-            query += f"WHERE {where_clause} "
+        :param filters: the filters to apply, in the format described in `filter_documents`.
+        :param chunk: the number of result rows converted to Documents at a time.
+        :return: an iterator over the matching Documents.
+        """
+        if chunk <= 0:
+            raise ValueError(f"chunk must be > 0, but got {chunk}")
+
+        # Only the query itself needs the connection: its result can be read while other statements run
+        with self._lock:
+            if filters:
+                where_clause, params = self._build_filter_query(filters)
+                result = self.connection.execute(self._prepared_filter(where_clause), params)
+            else:
+                result = self.connection.execute(self._ps_all)
 
-        query += "RETURN d.id, d.content, d.meta_STRING, d.meta_INT, d.meta_FLOAT"
+        return self._iter_result_documents(result, chunk)
 
-        result = self.connection.execute(query)
+    def _iter_result_documents(self, result: kuzu.QueryResult, chunk: int) -> Iterator[Document]:
+        """
+        Yields the documents of a query returning `_DOCUMENT_COLUMNS`, fetching `chunk` rows at a time.
 
+        An instance method so that the generator keeps the store, and with it the database, open
+        until the result has been read.
+        """
         while result.has_next():
-            row = result.get_next()
-            doc_id, content, meta_string, meta_int, meta_float = row
+            for doc_id, content, meta_string, meta_int, meta_float, embedding in result.get_n(chunk):
+                meta = _merge_meta(meta_string, meta_int, meta_float)
+                yield Document(id=doc_id, content=content, meta=meta, embedding=embedding)
 
-            # Initialize an empty meta dictionary
-            meta = {}
+    def embedding_retrieval(self, query_embedding: List[float], top_k: int = 10) -> List[Document]:
+        """
+        Returns the `top_k` documents whose embeddings are most similar to `query_embedding` by cosine similarity.
 
-           # Directly update meta with the existing dictionaries if they are not empty
-            if meta_string:
-                meta.update(meta_string)
-            if meta_int:
-                meta.update(meta_int)
-            if meta_float:
-                meta.update(meta_float)
+        Uses the HNSW vector index when the store was created with `embedding_dim`; otherwise the
+        similarity is computed inside Kuzu over every embedding of the same dimension.
 
-            # Append the document with parsed metadata to the list
-            documents.append(Document(id=doc_id, content=content, meta=meta))
+        :param query_embedding: the embedding of the query.
+        :param top_k: the maximum number of documents to return.
+        :return: the matching Documents, most similar first, with `score` set to the cosine similarity.
+        """
+        if not query_embedding:
+            raise ValueError("query_embedding must be a non-empty list of floats.")
+        dim = len(query_embedding)
+        if self.embedding_dim and dim != self.embedding_dim:
+            raise ValueError(f"query_embedding has dimension {dim}, but the store expects {self.embedding_dim}.")
+
+        if self.embedding_dim:
+            query = f"""
+            CALL QUERY_VECTOR_INDEX('documents', '{_VECTOR_INDEX}', $embedding, $top_k)
+            WITH node AS d, distance
+            RETURN {_DOCUMENT_COLUMNS}, 1 - distance AS score
+            ORDER BY score DESC
+            """
+        else:
+            query = f"""
+            MATCH (d:documents)
+            WHERE size(d.embedding) = {dim}
+            RETURN {_DOCUMENT_COLUMNS},
+                array_cosine_similarity(CAST(d.embedding AS FLOAT[{dim}]), CAST($embedding AS FLOAT[{dim}])) AS score
+            ORDER BY score DESC
+            LIMIT $top_k
+            """
 
+        documents = []
+        with self._lock:
+            result = self.connection.execute(query, {"embedding": query_embedding, "top_k": top_k})
+            while result.has_next():
+                doc_id, content, meta_string, meta_int, meta_float, embedding, score = result.get_next()
+                meta = _merge_meta(meta_string, meta_int, meta_float)
+                documents.append(Document(id=doc_id, content=content, meta=meta, embedding=embedding, score=score))
         return documents
 
+    def content_search(self, query: str, top_k: int = 10) -> List[Document]:
+        """
+        Returns up to `top_k` documents whose content contains `query` as a substring.
+
+        :param query: the text to search for.
+        :param top_k: the maximum number of documents to return.
+        :return: the matching Documents, in no particular order.
+        """
+        with self._lock:
+            result = self.connection.execute(self._ps_content_search, {"query": query, "limit": top_k})
+            # LIMIT already caps the rows at top_k, so they are all fetched in one chunk
+            return list(self._iter_result_documents(result, max(top_k, 1)))
 
     def to_dict(self) -> Dict[str, Any]:
         """Serializes this store to a dictionary."""
         return {
             "type": "KuzuDocumentStore",
-            "db_path": self.db.database_path
+            "db_path": self._db_path,
+            "bulk_load_mode": self.bulk_load_mode,
+            "embedding_dim": self.embedding_dim,
         }
 
 
@@ -347,4 +879,8 @@ class KuzuDocumentStore:
             raise DeserializationError("Missing 'db_path' in 'init_parameters'")
 
         # Create and return a new instance of KuzuDocumentStore with the extracted parameters
-        return cls(db_path=db_path)
+        return cls(
+            db_path=db_path,
+            bulk_load_mode=data.get("bulk_load_mode", False),
+            embedding_dim=data.get("embedding_dim"),
+        )
@@ -1,5 +1,4 @@
-import ast
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from haystack import component
 
@@ -29,28 +28,21 @@ class KuzuRetriever:
         self.top_k = top_k
         self.document_store = document_store
 
-    def run(self, query: str):
+    def run(self, query: Optional[str] = None, query_embedding: Optional[List[float]] = None):
         """
         Run the Retriever on the given query.
 
+        When `query_embedding` is given, documents are ranked by embedding similarity;
+        otherwise they are matched by substring search on their content.
+
         :param query: The search query string
+        :param query_embedding: The embedding of the query
         :return: Dictionary containing retrieved documents
         """
+        if query_embedding is not None:
+            return {"documents": self.document_store.embedding_retrieval(query_embedding, top_k=self.top_k)}
+        if query is None:
+            msg = "Either query or query_embedding must be provided"
+            raise ValueError(msg)
 
-        # Execute search query using Kuzu's capabilities
-        results = self.document_store.connection.execute(
-            """
-            MATCH (d:documents)
-            WHERE d.content CONTAINS $query
-            RETURN d.id, d.content, d.meta
-            LIMIT $limit
-        """,
-            {"query": query, "limit": self.top_k},
-        )
-
-        retrieved_docs = []
-        while row := results.get_next():
-            doc = {"id": row["d.id"], "content": row["d.content"], "meta": ast.literal_eval(row["d.meta"])}
-            retrieved_docs.append(doc)
-
-        return {"documents": retrieved_docs[: self.top_k]}
+        return {"documents": self.document_store.content_search(query, top_k=self.top_k)}
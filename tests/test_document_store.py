@@ -2,46 +2,137 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import enum
 import os
+import threading
+from dataclasses import replace
+from typing import Iterator, List
+
 import pytest
 from haystack.testing.document_store import DocumentStoreBaseTests
 from haystack import Document
-from haystack.document_stores.errors import DuplicateDocumentError
+from haystack.document_stores.errors import DuplicateDocumentError, MissingDocumentError
 from haystack_integrations.document_stores.kuzu_store import KuzuDocumentStore
+from haystack_integrations.retrievers.kuzu_store import KuzuRetriever
+
+# Documents shared by several tests; the store does not modify the documents it is given
+_DOCS_RW = [
+    Document(content="test1", meta={"keystring": "value1", "keyint": 1, "keyfloat": 1.0}),
+    Document(content="test2", meta={"keystring": "value2", "keyint": 2, "keyfloat": 2.0}),
+]
+_DOCS_FILTER = [
+    Document(content="doc1", meta={"type": "article", "rating": 4}),
+    Document(content="doc2", meta={"type": "blog", "rating": 3}),
+    Document(content="doc3", meta={"type": "article", "rating": 5}),
+]
+_DOCS_DEL = [Document(content="test1", id="1"), Document(content="test2", id="2")]
+
+# Inherited `DocumentStoreBaseTests` cases covering behaviour this store deliberately does not have
+_UNSUPPORTED_BASE_TESTS = {
+    **{
+        f"test_comparison_{op}_with_none": "filters on None values are not supported"
+        for op in ["equal", "not_equal", "greater_than", "greater_than_equal", "less_than", "less_than_equal"]
+    },
+    **{
+        f"test_comparison_{op}_with_{value}": "range filters are not validated against strings and lists"
+        for op in ["greater_than", "greater_than_equal", "less_than", "less_than_equal"]
+        for value in ["string", "list"]
+    },
+    **{
+        f"test_comparison_{op}_with_with_non_list{suffix}": "malformed filters raise ValueError, not FilterError"
+        for op in ["in", "not_in"]
+        for suffix in ["", "_iterable"]
+    },
+    **{
+        f"test_missing_{key}": "malformed filters raise ValueError, not FilterError"
+        for key in [
+            "top_level_operator_key",
+            "top_level_conditions_key",
+            "condition_field_key",
+            "condition_operator_key",
+            "condition_value_key",
+        ]
+    },
+    "test_write_documents_invalid_input": "documents are not type-checked on write",
+    "test_delete_documents_empty_document_store": "deleting unknown ids raises MissingDocumentError",
+    "test_delete_documents_non_existing_document": "deleting unknown ids raises MissingDocumentError",
+}
+
 
 class TestKuzuDocumentStore(DocumentStoreBaseTests):
     """
     Test cases for KuzuDocumentStore implementation
     """
 
+    @pytest.fixture(scope="class")
+    @classmethod
+    def docstore(cls) -> Iterator[KuzuDocumentStore]:
+        """
+        Creates one in-memory KuzuDocumentStore instance shared by the tests of the class;
+        tests covering persistence or closing the store open their own
+        """
+        docstore = KuzuDocumentStore(db_path=":memory:")
+        yield docstore
+        docstore.close()
+
     @pytest.fixture
-    def docstore(self, tmp_path) -> KuzuDocumentStore:
+    def document_store(self, docstore) -> KuzuDocumentStore:
+        """
+        The shared store under the name used by the inherited `DocumentStoreBaseTests`
+        """
+        return docstore
+
+    def assert_documents_are_equal(self, received: List[Document], expected: List[Document]):
+        """
+        Embeddings are stored as 32-bit floats, so they are compared approximately
+        """
+        assert len(received) == len(expected)
+        received = sorted(received, key=lambda doc: doc.id)
+        expected = sorted(expected, key=lambda doc: doc.id)
+        for received_doc, expected_doc in zip(received, expected):
+            if expected_doc.embedding is None:
+                assert received_doc.embedding is None
+            else:
+                assert received_doc.embedding == pytest.approx(expected_doc.embedding)
+            assert replace(received_doc, embedding=None) == replace(expected_doc, embedding=None)
+
+    @pytest.fixture(autouse=True)
+    def _skip_unsupported(self, request):
+        """
+        Skips the inherited tests listed in `_UNSUPPORTED_BASE_TESTS`
         """
-        Creates a fresh KuzuDocumentStore instance for each test
+        reason = _UNSUPPORTED_BASE_TESTS.get(request.node.originalname)
+        if reason:
+            pytest.skip(reason)
+
+    @pytest.fixture(autouse=True)
+    def _reset_docstore(self, request):
+        """
+        Empties the shared store before each test that uses it
         """
-        db_path = str(tmp_path / "kuzu_test.db")
-        return KuzuDocumentStore(db_path=db_path)
+        if "docstore" in request.fixturenames:
+            docstore = request.getfixturevalue("docstore")
+            docstore.connection.execute("MATCH (d:documents) DETACH DELETE d")
+            docstore.invalidate_count()
+
+    def test_write_documents(self, document_store):
+        doc = Document(content="test doc")
+        assert document_store.write_documents([doc]) == 1
+        self.assert_documents_are_equal(document_store.filter_documents(), [doc])
+
+        # Without a policy a duplicate id is rejected
+        with pytest.raises(DuplicateDocumentError):
+            document_store.write_documents([doc])
 
     def test_write_and_read_documents(self, docstore):
-        docs = [
-            Document(content="test1", meta={"keystring": "value1", "keyint": 1, "keyfloat": 1.0}),
-            Document(content="test2", meta={"keystring": "value2", "keyint": 2, "keyfloat": 2.0})
-        ]
-        docstore.write_documents(docs)
+        docstore.write_documents(_DOCS_RW)
         assert docstore.count_documents() == 2
         
-        retrieved = docstore.filter_documents()
-        #print(f"retrieved = {retrieved}")
-        assert len(retrieved) == 2
-        assert retrieved[0].content in ["test1", "test2"]
+        for content in ["test1", "test2"]:
+            assert len(docstore.filter_documents({"field": "content", "operator": "==", "value": content})) == 1
 
     def test_write_and_read_complex_documents(self, docstore):
-        docs = [
-            Document(content="doc1", meta={"type": "article", "rating": 4}),
-            Document(content="doc2", meta={"type": "blog", "rating": 3}),
-            Document(content="doc3", meta={"type": "article", "rating": 5})
-        ]
-        docstore.write_documents(docs)
+        docstore.write_documents(_DOCS_FILTER)
         assert docstore.count_documents() == 3
         
         retrieved = docstore.filter_documents()
@@ -52,28 +143,29 @@ class TestKuzuDocumentStore(DocumentStoreBaseTests):
 
     def test_duplicate_policy(self, docstore):
         doc = Document(content="test", id="1")
-        docstore.write_documents([doc])
-        
-        # Test FAIL policy
-        with pytest.raises(DuplicateDocumentError):
-            docstore.write_documents([doc], policy="fail")
 
-        # Test SKIP policy
-        assert docstore.write_documents([doc], policy="skip") == 0
+        # One outer transaction for the whole sweep: the store joins it rather than committing per call,
+        # and FAIL raises before any statement runs, so the transaction stays usable afterwards
+        with docstore._transaction():
+            docstore.write_documents([doc])
+
+            # Test FAIL policy
+            with pytest.raises(DuplicateDocumentError):
+                docstore.write_documents([doc], policy="fail")
+
+            # Test SKIP policy
+            assert docstore.write_documents([doc], policy="skip") == 0
+
+            # Test OVERWRITE policy
+            new_doc = Document(content="updated", id="1")
+            assert docstore.write_documents([new_doc], policy="overwrite") == 1
 
-        # Test OVERWRITE policy
-        new_doc = Document(content="updated", id="1")
-        assert docstore.write_documents([new_doc], policy="overwrite") == 1
         retrieved = docstore.filter_documents()
+        assert len(retrieved) == 1
         assert retrieved[0].content == "updated"
 
     def test_complex_filters(self, docstore):
-        docs = [
-            Document(content="doc1", meta={"type": "article", "rating": 4}),
-            Document(content="doc2", meta={"type": "blog", "rating": 3}),
-            Document(content="doc3", meta={"type": "article", "rating": 5})
-        ]
-        docstore.write_documents(docs)
+        docstore.write_documents(_DOCS_FILTER)
 
         filters = {
             "operator": "AND",
@@ -88,28 +180,369 @@ class TestKuzuDocumentStore(DocumentStoreBaseTests):
         results = docstore.filter_documents(filters)
         #print(f"results = {results}")
         assert len(results) == 2
-        assert all(d.meta["type"] == "article" and d.meta["rating"] >= 4 for d in results)
+        mismatch = next((d for d in results if d.meta["type"] != "article" or d.meta["rating"] < 4), None)
+        assert mismatch is None, mismatch
 
     def test_delete_documents(self, docstore):
-        docs = [
-            Document(content="test1", id="1"),
-            Document(content="test2", id="2")
-        ]
-        docstore.write_documents(docs)
+        docstore.write_documents(_DOCS_DEL)
         assert docstore.count_documents() == 2
 
         docstore.delete_documents(["1"])
         assert docstore.count_documents() == 1
-        
-        retrieved = docstore.filter_documents()
-        assert retrieved[0].id == "2"
 
-    def test_serialization(self, docstore, tmp_path):
+        assert docstore.exists("1") is False
+        assert docstore.exists("2") is True
+
+    def test_serialization(self, tmp_path):
+        docstore = KuzuDocumentStore(db_path=str(tmp_path / "kuzu_test.db"))
         docs = [Document(content="test")]
         docstore.write_documents(docs)
         
         serialized = docstore.to_dict()
-        assert "db_path" in serialized
+        assert serialized["db_path"] == str(tmp_path / "kuzu_test.db")
         
         new_store = KuzuDocumentStore.from_dict(serialized)
         assert new_store.count_documents() == 1
+
+    def test_duplicates_within_batch(self, docstore):
+        docs = [Document(content="first", id="1"), Document(content="second", id="1")]
+
+        with pytest.raises(DuplicateDocumentError):
+            docstore.write_documents(docs, policy="fail")
+        assert docstore.count_documents() == 0
+
+        assert docstore.write_documents(docs, policy="skip") == 1
+        assert docstore.filter_documents()[0].content == "first"
+
+        assert docstore.write_documents(docs, policy="overwrite") == 1
+        assert docstore.count_documents() == 1
+        assert docstore.filter_documents()[0].content == "second"
+
+    def test_failed_write_is_rolled_back(self, docstore):
+        docstore.write_documents([Document(content="test1", id="1")])
+
+        # The overwrite deletes "1" before the batch insert fails on an INT64 overflow, so both are undone
+        batch = [Document(content="again", id="1"), Document(content="test2", id="2", meta={"big": 2**70})]
+        with pytest.raises(RuntimeError):
+            docstore.write_documents(batch, policy="overwrite")
+        assert docstore.count_documents() == 1
+        assert docstore.filter_documents()[0].content == "test1"
+
+    def test_bulk_load_mode(self, tmp_path):
+        db_path = str(tmp_path / "kuzu_bulk.db")
+        docstore = KuzuDocumentStore(db_path=db_path, bulk_load_mode=True)
+        docstore.write_documents([Document(content="test1"), Document(content="test2")])
+        assert docstore.bulk_load((Document(content=f"doc{i}") for i in range(25)), batch_size=10) == 25
+        docstore.close()
+
+        assert KuzuDocumentStore(db_path=db_path).count_documents() == 27
+
+    def test_close_after_failed_checkpoint(self, tmp_path, monkeypatch):
+        docstore = KuzuDocumentStore(db_path=str(tmp_path / "kuzu_bulk.db"), bulk_load_mode=True)
+        connection, db = docstore.connection, docstore.db
+        closed = []
+
+        def failing_checkpoint(query, *args, **kwargs):
+            raise RuntimeError("checkpoint failed")
+
+        monkeypatch.setattr(connection, "execute", failing_checkpoint)
+        monkeypatch.setattr(connection, "close", lambda: closed.append("connection"))
+        monkeypatch.setattr(db, "close", lambda: closed.append("db"))
+
+        with pytest.raises(RuntimeError, match="checkpoint failed"):
+            docstore.close()
+        assert closed == ["connection", "db"]
+
+        monkeypatch.undo()
+        connection.close()
+        db.close()
+
+    def test_concurrent_writes(self):
+        docstore = KuzuDocumentStore(db_path=":memory:")
+
+        def write(prefix):
+            for i in range(10):
+                docstore.write_documents([Document(content=f"{prefix}-{i}")])
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert docstore.count_documents() == 40
+        docstore.close()
+        docstore.close()
+
+    def test_filter_documents_many_chunks(self, docstore):
+        docs = [Document(content=f"doc{i}", meta={"keyint": i}) for i in range(1000)]
+        docstore.write_documents(docs)
+
+        retrieved = docstore.filter_documents()
+        assert sorted(d.meta["keyint"] for d in retrieved) == list(range(1000))
+
+    def test_filters_are_parameterized(self, docstore):
+        docs = [
+            Document(content="doc1", meta={"author": "O'Brien", "rating": 4}),
+            Document(content="doc2", meta={"author": "Smith", "rating": 3}),
+            Document(content="doc3", meta={"author": "Jones", "rating": 5}),
+        ]
+        docstore.write_documents(docs)
+
+        results = docstore.filter_documents({"field": "meta.author", "operator": "==", "value": "O'Brien"})
+        assert [d.content for d in results] == ["doc1"]
+
+        results = docstore.filter_documents({"field": "meta.rating", "operator": "in", "value": [3, 5]})
+        assert sorted(d.content for d in results) == ["doc2", "doc3"]
+
+        results = docstore.filter_documents({"field": "meta.rating", "operator": "not in", "value": [3, 5]})
+        assert [d.content for d in results] == ["doc1"]
+
+        # Same structure, different values: the compiled clause is reused
+        where_a, params_a = docstore._build_filter_query({"field": "meta.author", "operator": "==", "value": "a"})
+        where_b, params_b = docstore._build_filter_query({"field": "meta.author", "operator": "==", "value": "b"})
+        assert where_a == where_b
+        assert params_a != params_b
+
+        # ...and so is its prepared statement
+        cached = len(docstore._filter_statements)
+        results = docstore.filter_documents({"field": "meta.author", "operator": "==", "value": "Smith"})
+        assert [d.content for d in results] == ["doc2"]
+        assert len(docstore._filter_statements) == cached
+
+    def test_delete_missing_documents(self, docstore):
+        docstore.write_documents([Document(content="test1", id="1"), Document(content="test2", id="2")])
+
+        with pytest.raises(MissingDocumentError, match="'3', '4'"):
+            docstore.delete_documents(["1", "3", "4"])
+        assert docstore.count_documents() == 2
+
+        docstore.delete_documents(["1", "2", "2"])
+        assert docstore.count_documents() == 0
+
+    @pytest.mark.parametrize("embedding_dim", [None, 3])
+    def test_embedding_retrieval(self, tmp_path, embedding_dim):
+        docstore = KuzuDocumentStore(db_path=str(tmp_path / "kuzu_vector.db"), embedding_dim=embedding_dim)
+        docs = [
+            Document(content="x", id="x", embedding=[1.0, 0.0, 0.0]),
+            Document(content="y", id="y", embedding=[0.0, 1.0, 0.0]),
+            Document(content="xy", id="xy", embedding=[0.7, 0.7, 0.0]),
+            Document(content="none", id="none"),
+        ]
+        docstore.write_documents(docs)
+
+        retrieved = docstore.embedding_retrieval([0.9, 0.1, 0.0], top_k=2)
+        assert [d.id for d in retrieved] == ["x", "xy"]
+        assert retrieved[0].score > retrieved[1].score
+        assert retrieved[0].embedding == [1.0, 0.0, 0.0]
+
+        retriever = KuzuRetriever(document_store=docstore, top_k=1)
+        assert [d.id for d in retriever.run(query_embedding=[0.0, 1.0, 0.0])["documents"]] == ["y"]
+
+    def test_reopen_with_different_embedding_dim(self, tmp_path):
+        db_path = str(tmp_path / "kuzu_vector.db")
+        KuzuDocumentStore(db_path=db_path, embedding_dim=2).close()
+        KuzuDocumentStore(db_path=str(tmp_path / "kuzu_plain.db")).close()
+
+        with pytest.raises(ValueError, match=r"stores embeddings as FLOAT\[2\]"):
+            KuzuDocumentStore(db_path=db_path, embedding_dim=3)
+        with pytest.raises(ValueError, match=r"stores embeddings as FLOAT\[2\]"):
+            KuzuDocumentStore(db_path=db_path)
+        with pytest.raises(ValueError, match=r"stores embeddings as FLOAT\[\]"):
+            KuzuDocumentStore(db_path=str(tmp_path / "kuzu_plain.db"), embedding_dim=2)
+
+        docstore = KuzuDocumentStore(db_path=db_path, embedding_dim=2)
+        assert docstore.write_documents([Document(content="x", embedding=[1.0, 0.0])]) == 1
+
+    def test_filter_ids(self, docstore):
+        docs = [
+            Document(content="doc1", id="1", meta={"type": "article"}),
+            Document(content="doc2", id="2", meta={"type": "blog"}),
+            Document(content="doc3", id="3", meta={"type": "article"}),
+        ]
+        docstore.write_documents(docs)
+
+        assert sorted(docstore.filter_ids()) == ["1", "2", "3"]
+        assert sorted(docstore.filter_ids({"field": "meta.type", "operator": "==", "value": "article"})) == ["1", "3"]
+        assert len(docstore.filter_ids(limit=2)) == 2
+
+        filters = {
+            "operator": "AND",
+            "conditions": [
+                {"field": "id", "operator": "in", "value": ["1", "2"]},
+                {"field": "meta.type", "operator": "==", "value": "article"},
+            ],
+        }
+        assert docstore.filter_ids(filters) == ["1"]
+        assert sorted(docstore.filter_ids({"field": "content", "operator": "!=", "value": "doc2"})) == ["1", "3"]
+
+    def test_retriever_text_query(self, docstore):
+        docs = [
+            Document(content="the quick fox", meta={"keyint": 1}),
+            Document(content="a quick hare"),
+            Document(content="a slow snail"),
+        ]
+        docstore.write_documents(docs)
+
+        retriever = KuzuRetriever(document_store=docstore, top_k=5)
+        retrieved = retriever.run(query="quick")["documents"]
+        assert sorted(d.content for d in retrieved) == ["a quick hare", "the quick fox"]
+        assert KuzuRetriever(document_store=docstore, top_k=1).run(query="quick")["documents"][0].content in [
+            "a quick hare",
+            "the quick fox",
+        ]
+        assert retriever.run(query="missing")["documents"] == []
+        assert [d.content for d in docstore.content_search("slow", top_k=5)] == ["a slow snail"]
+
+    def test_count_is_maintained(self, docstore):
+        assert docstore.count_documents() == 0
+        docstore.write_documents([Document(content="test1", id="1"), Document(content="test2", id="2")])
+        assert docstore.count_documents() == 2
+
+        docstore.write_documents([Document(content="updated", id="1")], policy="overwrite")
+        assert docstore.count_documents() == 2
+
+        with pytest.raises(DuplicateDocumentError):
+            docstore.write_documents([Document(content="new", id="3"), Document(content="dup", id="1")], policy="fail")
+        assert docstore.count_documents() == 2
+
+        docstore.delete_documents(["1"])
+        assert docstore.count_documents() == 1
+
+        # Changes made behind the store's back are only seen after invalidation
+        docstore.connection.execute("MATCH (d:documents) DELETE d")
+        assert docstore.count_documents() == 1
+        docstore.invalidate_count()
+        assert docstore.count_documents() == 0
+
+    def test_iter_documents(self, docstore):
+        docstore.write_documents([Document(content=f"doc{i}", meta={"keyint": i % 2}) for i in range(10)])
+
+        iterator = docstore.iter_documents({"field": "meta.keyint", "operator": "==", "value": 1}, chunk=2)
+        first = next(iterator)
+        assert first.meta["keyint"] == 1
+        assert len([first, *iterator]) == 5
+
+        # Invalid filters are reported by the call itself, not on the first next()
+        with pytest.raises(ValueError, match="Unsupported field format"):
+            docstore.iter_documents({"field": "bogus", "operator": "==", "value": 1})
+        with pytest.raises(ValueError, match="chunk must be > 0"):
+            docstore.iter_documents(chunk=0)
+
+    def test_iter_documents_outlives_store(self):
+        def stream_documents():
+            store = KuzuDocumentStore(":memory:")
+            store.write_documents([Document(content=f"doc{i}") for i in range(20)])
+            # Only the iterator is returned; the store itself is no longer referenced
+            return store.iter_documents(chunk=10)
+
+        assert len(list(stream_documents())) == 20
+
+    def test_bulk_copy_documents(self, docstore):
+        pytest.importorskip("pyarrow")
+        docstore.write_documents([Document(content="existing", id="0")])
+        docs = [
+            Document(content="doc1", id="1", meta={"type": "article", "rating": 4, "score": 0.5}),
+            Document(content="doc2", id="2", embedding=[0.5, 0.5]),
+        ]
+
+        assert docstore.bulk_copy_documents(docs) == 2
+        assert docstore.count_documents() == 3
+        retrieved = {d.id: d for d in docstore.filter_documents()}
+        assert retrieved["1"].meta == {"type": "article", "rating": 4, "score": 0.5}
+        assert retrieved["2"].embedding == [0.5, 0.5]
+
+    def test_write_mixed_bool_and_int_meta(self, docstore):
+        docs = [
+            Document(content="flagged", id="1", meta={"flag": True, "rating": 4}),
+            Document(content="rated", id="2", meta={"rating": 300}),
+        ]
+        assert docstore.write_documents(docs) == 2
+
+        results = docstore.filter_documents({"field": "meta.rating", "operator": "<", "value": 10})
+        assert [d.id for d in results] == ["1"]
+        assert results[0].meta == {"flag": 1, "rating": 4}
+
+    def test_filter_on_missing_meta_key(self, docstore):
+        docs = [
+            Document(content="doc1", id="1", meta={"type": "article", "rating": 4}),
+            Document(content="doc2", id="2", meta={"type": "blog"}),
+            Document(content="doc3", id="3"),
+        ]
+        docstore.write_documents(docs)
+
+        assert docstore.filter_ids({"field": "meta.rating", "operator": ">=", "value": 1}) == ["1"]
+        assert sorted(docstore.filter_ids({"field": "meta.rating", "operator": "!=", "value": 4})) == ["2", "3"]
+        assert sorted(docstore.filter_ids({"field": "meta.type", "operator": "not in", "value": ["blog"]})) == [
+            "1",
+            "3",
+        ]
+
+    def test_not_filter(self, docstore):
+        docstore.write_documents(_DOCS_FILTER)
+
+        filters = {
+            "operator": "NOT",
+            "conditions": [
+                {"field": "meta.type", "operator": "==", "value": "article"},
+                {"field": "meta.rating", "operator": ">=", "value": 5},
+            ],
+        }
+        assert sorted(d.content for d in docstore.filter_documents(filters)) == ["doc1", "doc2"]
+
+        nested = {"operator": "NOT", "conditions": [{"operator": "OR", "conditions": filters["conditions"]}]}
+        assert [d.content for d in docstore.filter_documents(nested)] == ["doc2"]
+
+    def test_interrupted_transaction_is_rolled_back(self, docstore):
+        with pytest.raises(KeyboardInterrupt):
+            with docstore._transaction():
+                docstore.write_documents([Document(content="interrupted", id="1")])
+                raise KeyboardInterrupt
+
+        assert docstore.count_documents() == 0
+        docstore.write_documents([Document(content="test", id="2")])
+        # The write committed on its own, so no transaction is left open
+        with pytest.raises(RuntimeError, match="No active transaction"):
+            docstore.connection.execute("COMMIT")
+        assert docstore.exists("2")
+
+    def test_count_after_failed_commit(self, docstore, monkeypatch):
+        docstore.write_documents([Document(content="test1", id="1")])
+        assert docstore.count_documents() == 1
+
+        execute = docstore.connection.execute
+
+        def failing_commit(query, *args, **kwargs):
+            if query == "COMMIT":
+                raise RuntimeError("commit failed")
+            return execute(query, *args, **kwargs)
+
+        monkeypatch.setattr(docstore.connection, "execute", failing_commit)
+        with pytest.raises(RuntimeError, match="commit failed"):
+            docstore.write_documents([Document(content="test2", id="2")])
+        monkeypatch.undo()
+
+        assert docstore.count_documents() == 1
+        assert not docstore.exists("2")
+
+    def test_in_filter_values_share_one_type(self, docstore):
+        docstore.write_documents([Document(content="doc1", id="1", meta={"r": 2, "flag": True})])
+
+        for value in [[3, 2.9], [3, "2"]]:
+            with pytest.raises(ValueError, match="must all be"):
+                docstore.filter_ids({"field": "meta.r", "operator": "in", "value": value})
+        assert docstore.filter_ids({"field": "meta.r", "operator": "in", "value": [3, 2]}) == ["1"]
+        assert docstore.filter_ids({"field": "meta.flag", "operator": "in", "value": [True, 5]}) == ["1"]
+        assert docstore.filter_ids({"field": "meta.r", "operator": "not in", "value": [True]}) == ["1"]
+
+    def test_filter_on_meta_subclass_values(self, docstore):
+        class Kind(str, enum.Enum):
+            ARTICLE = "article"
+
+        class Score(float):
+            pass
+
+        docstore.write_documents([Document(content="doc1", id="1", meta={"kind": Kind.ARTICLE, "score": Score(0.5)})])
+
+        assert docstore.filter_ids({"field": "meta.kind", "operator": "==", "value": Kind.ARTICLE}) == ["1"]
+        assert docstore.filter_ids({"field": "meta.score", "operator": "in", "value": [Score(0.5), 1.0]}) == ["1"]